@@ -5,12 +5,13 @@ Add HermesTests target to Hermes.xcodeproj
 
 import os
 import sys
-import uuid
-import re
 
-def generate_uuid():
-    """Generate a UUID in Xcode format (24 hex chars)"""
-    return uuid.uuid4().hex[:24].upper()
+from pbxproj_index import build_index, read_project, write_spliced
+
+def _uuid_batch(n):
+    """Generate n UUIDs in Xcode format (24 hex chars) from one urandom read"""
+    raw = os.urandom(12 * n)
+    return [raw[i * 12:(i + 1) * 12].hex().upper() for i in range(n)]
 
 def add_test_target():
     """Add test target to Xcode project"""
@@ -21,64 +22,77 @@ def add_test_target():
         print(f"Error: {project_path} not found")
         return False
     
-    # Read project file
-    with open(project_path, 'r') as f:
-        content = f.read()
-    
-    # Generate UUIDs for new objects
-    test_target_uuid = generate_uuid()
-    test_product_uuid = generate_uuid()
-    test_build_config_list_uuid = generate_uuid()
-    test_debug_config_uuid = generate_uuid()
-    test_release_config_uuid = generate_uuid()
-    test_sources_phase_uuid = generate_uuid()
-    test_frameworks_phase_uuid = generate_uuid()
-    test_resources_phase_uuid = generate_uuid()
-    
-    # Test file UUIDs
-    login_tests_uuid = generate_uuid()
-    stations_tests_uuid = generate_uuid()
-    history_tests_uuid = generate_uuid()
+    content = read_project(project_path)
+    
+    # Generate UUIDs for new objects; every one is referenced below
+    (
+        test_target_uuid,
+        test_product_uuid,
+        test_build_config_list_uuid,
+        test_debug_config_uuid,
+        test_release_config_uuid,
+        test_sources_phase_uuid,
+        test_frameworks_phase_uuid,
+        test_resources_phase_uuid,
+        tests_group_uuid,
+        viewmodels_group_uuid,
+        target_dep_uuid,
+        target_proxy_uuid,
+        # Test file UUIDs
+        login_tests_uuid,
+        stations_tests_uuid,
+        history_tests_uuid,
+        # Test file build file UUIDs
+        login_src_uuid,
+        stations_src_uuid,
+        history_src_uuid,
+    ) = _uuid_batch(18)
+    
+    index = build_index(content)
     
     # Find the main target UUID
-    main_target_match = re.search(r'([A-F0-9]{24}) /\* Hermes \*/ = \{[^}]*isa = PBXNativeTarget', content)
-    if not main_target_match:
+    main_target_uuid = index.native_targets.get("Hermes")
+    if not main_target_uuid:
         print("Error: Could not find main Hermes target")
         return False
     
-    main_target_uuid = main_target_match.group(1)
+    if not index.project_uuid:
+        print("Error: Could not find project object")
+        return False
+    
+    if "HermesTests" in index.native_targets:
+        print("Error: HermesTests target already exists")
+        return False
     
     print(f"Found main target: {main_target_uuid}")
     print(f"Creating test target: {test_target_uuid}")
     
+    # Add build files for the test sources
+    test_build_files = f"""\
+		{login_src_uuid} /* LoginViewModelTests.swift in Sources */ = {{isa = PBXBuildFile; fileRef = {login_tests_uuid} /* LoginViewModelTests.swift */; }};
+		{stations_src_uuid} /* StationsViewModelTests.swift in Sources */ = {{isa = PBXBuildFile; fileRef = {stations_tests_uuid} /* StationsViewModelTests.swift */; }};
+		{history_src_uuid} /* HistoryViewModelTests.swift in Sources */ = {{isa = PBXBuildFile; fileRef = {history_tests_uuid} /* HistoryViewModelTests.swift */; }};
+"""
+    
     # Add test file references
-    test_files_section = f"""
-/* Begin PBXFileReference section - Test Files */
+    test_files_section = f"""\
 		{login_tests_uuid} /* LoginViewModelTests.swift */ = {{isa = PBXFileReference; lastKnownFileType = sourcecode.swift; path = LoginViewModelTests.swift; sourceTree = "<group>"; }};
 		{stations_tests_uuid} /* StationsViewModelTests.swift */ = {{isa = PBXFileReference; lastKnownFileType = sourcecode.swift; path = StationsViewModelTests.swift; sourceTree = "<group>"; }};
 		{history_tests_uuid} /* HistoryViewModelTests.swift */ = {{isa = PBXFileReference; lastKnownFileType = sourcecode.swift; path = HistoryViewModelTests.swift; sourceTree = "<group>"; }};
 		{test_product_uuid} /* HermesTests.xctest */ = {{isa = PBXFileReference; explicitFileType = wrapper.cfbundle; includeInIndex = 0; path = HermesTests.xctest; sourceTree = BUILT_PRODUCTS_DIR; }};
-/* End PBXFileReference section - Test Files */
 """
     
-    # Insert after first PBXFileReference section
-    content = content.replace(
-        "/* End PBXFileReference section */",
-        test_files_section + "\n/* End PBXFileReference section */",
-        1
-    )
-    
     # Add test group
-    test_group = f"""
-		{generate_uuid()} /* Tests */ = {{
+    test_group = f"""\
+		{tests_group_uuid} /* Tests */ = {{
 			isa = PBXGroup;
 			children = (
-				{generate_uuid()} /* ViewModels */,
+				{viewmodels_group_uuid} /* ViewModels */,
 			);
 			path = Tests;
 			sourceTree = "<group>";
 		}};
-		{generate_uuid()} /* ViewModels */ = {{
+		{viewmodels_group_uuid} /* ViewModels */ = {{
 			isa = PBXGroup;
 			children = (
 				{login_tests_uuid} /* LoginViewModelTests.swift */,
@@ -91,7 +105,7 @@ def add_test_target():
 """
     
     # Add test target
-    test_target = f"""
+    test_target = f"""\
 		{test_target_uuid} /* HermesTests */ = {{
 			isa = PBXNativeTarget;
 			buildConfigurationList = {test_build_config_list_uuid} /* Build configuration list for PBXNativeTarget "HermesTests" */;
@@ -103,7 +117,7 @@ def add_test_target():
 			buildRules = (
 			);
 			dependencies = (
-				{generate_uuid()} /* PBXTargetDependency */,
+				{target_dep_uuid} /* PBXTargetDependency */,
 			);
 			name = HermesTests;
 			productName = HermesTests;
@@ -112,18 +126,38 @@ def add_test_target():
 		}};
 """
     
+    # Make the test target depend on the main target
+    target_proxy = f"""\
+		{target_proxy_uuid} /* PBXContainerItemProxy */ = {{
+			isa = PBXContainerItemProxy;
+			containerPortal = {index.project_uuid} /* Project object */;
+			proxyType = 1;
+			remoteGlobalIDString = {main_target_uuid};
+			remoteInfo = Hermes;
+		}};
+"""
+    target_dependency = f"""\
+		{target_dep_uuid} /* PBXTargetDependency */ = {{
+			isa = PBXTargetDependency;
+			target = {main_target_uuid} /* Hermes */;
+			targetProxy = {target_proxy_uuid} /* PBXContainerItemProxy */;
+		}};
+"""
+    
     # Add build phases
-    build_phases = f"""
+    sources_phase = f"""\
 		{test_sources_phase_uuid} /* Sources */ = {{
 			isa = PBXSourcesBuildPhase;
 			buildActionMask = 2147483647;
 			files = (
-				{generate_uuid()} /* LoginViewModelTests.swift in Sources */,
-				{generate_uuid()} /* StationsViewModelTests.swift in Sources */,
-				{generate_uuid()} /* HistoryViewModelTests.swift in Sources */,
+				{login_src_uuid} /* LoginViewModelTests.swift in Sources */,
+				{stations_src_uuid} /* StationsViewModelTests.swift in Sources */,
+				{history_src_uuid} /* HistoryViewModelTests.swift in Sources */,
 			);
 			runOnlyForDeploymentPostprocessing = 0;
 		}};
+"""
+    frameworks_phase = f"""\
 		{test_frameworks_phase_uuid} /* Frameworks */ = {{
 			isa = PBXFrameworksBuildPhase;
 			buildActionMask = 2147483647;
@@ -131,6 +165,8 @@ def add_test_target():
 			);
 			runOnlyForDeploymentPostprocessing = 0;
 		}};
+"""
+    resources_phase = f"""\
 		{test_resources_phase_uuid} /* Resources */ = {{
 			isa = PBXResourcesBuildPhase;
 			buildActionMask = 2147483647;
@@ -141,7 +177,7 @@ def add_test_target():
 """
     
     # Add build configurations
-    build_configs = f"""
+    config_list = f"""\
 		{test_build_config_list_uuid} /* Build configuration list for PBXNativeTarget "HermesTests" */ = {{
 			isa = XCConfigurationList;
 			buildConfigurations = (
@@ -151,6 +187,8 @@ def add_test_target():
 			defaultConfigurationIsVisible = 0;
 			defaultConfigurationName = Release;
 		}};
+"""
+    build_configs = f"""\
 		{test_debug_config_uuid} /* Debug */ = {{
 			isa = XCBuildConfiguration;
 			buildSettings = {{
@@ -181,19 +219,64 @@ def add_test_target():
 		}};
 """
     
-    print("Test target configuration created")
-    print("\nNote: Manual Xcode project editing required")
-    print("Please add test target through Xcode:")
-    print("  1. File → New → Target")
-    print("  2. Unit Testing Bundle")
-    print("  3. Name: HermesTests")
-    print("  4. Add test files from Tests/ directory")
+    # Register the target with the project
+    project_target = f"""
+				{test_target_uuid} /* HermesTests */,"""
+    
+    # Show the Tests group in the navigator and the product under Products
+    main_group_child = f"""
+				{tests_group_uuid} /* Tests */,"""
+    products_child = f"""
+				{test_product_uuid} /* HermesTests.xctest */,"""
+    
+    # Every anchor comes from the index, so the file is emitted in a single
+    # pass rather than re-copied once per block.
+    blocks = [
+        ("PBXBuildFile", test_build_files),
+        ("PBXContainerItemProxy", target_proxy),
+        ("PBXFileReference", test_files_section),
+        ("PBXFrameworksBuildPhase", frameworks_phase),
+        ("PBXGroup", test_group),
+        ("PBXNativeTarget", test_target),
+        ("PBXResourcesBuildPhase", resources_phase),
+        ("PBXSourcesBuildPhase", sources_phase),
+        ("PBXTargetDependency", target_dependency),
+        ("XCBuildConfiguration", build_configs),
+        ("XCConfigurationList", config_list),
+    ]
+    
+    anchors = []
+    for section, block in blocks:
+        if section not in index.section_ends:
+            print(f"Error: Could not find the end of the {section} section")
+            return False
+        anchors.append((index.section_ends[section], block.encode()))
+    
+    if index.project_targets_insert == -1:
+        print("Error: Could not find project targets list")
+        return False
+    anchors.append((index.project_targets_insert, project_target.encode()))
+    
+    for role, group_uuid, child in (
+        ("main", index.main_group, main_group_child),
+        ("Products", index.products_group, products_child),
+    ):
+        if group_uuid not in index.group_children:
+            print(f"Error: Could not find the {role} group")
+            return False
+        anchors.append((index.group_children[group_uuid], child.encode()))
+    
+    write_spliced(project_path, content, anchors)
+    
+    print("Test target added to project")
+    print("\nRemaining steps in Xcode:")
+    print("  1. Add the HermesTests target to the Hermes scheme's Test action")
     
     return True
 
 if __name__ == "__main__":
     if add_test_target():
-        print("\n✅ Test target setup instructions provided")
+        print("\n✅ Test target added")
         sys.exit(0)
     else:
         print("\n❌ Failed to add test target")
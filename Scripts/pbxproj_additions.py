@@ -0,0 +1,163 @@
+"""
+Planning of file additions to a Hermes project.pbxproj.
+
+Used by xcode_add_file.py and pbxproj_batch.py. Nothing here writes the
+project; the planned insertions go to pbxproj_index.write_spliced().
+"""
+
+import os
+import sys
+from types import MappingProxyType
+
+from pbxproj_index import PROJECT_PATH
+
+MAIN_TARGET_SOURCES_UUID = '8D11072C0486CEB800E47090'  # Hermes target Sources build phase
+MAIN_TARGET_RESOURCES_UUID = '8D1107290486CEB800E47090'  # Hermes target Resources build phase
+
+# Map common directories to their group names; anything else uses the
+# directory name as-is
+GROUP_MAPPINGS = MappingProxyType({
+    'Utilities': 'Utilities',
+    'ViewModels': 'ViewModels',
+    'Views': 'Views',
+    'Models': 'Models',
+    'Swift': 'Swift',
+    'Pandora': 'Pandora',
+    'Controllers': 'Controllers',
+    'Integration': 'Integration',
+    'AudioStreamer': 'AudioStreamer',
+    'Icons': 'Icons',
+    'Resources': 'Resources',
+})
+
+
+def generate_uuid():
+    """Generate a 24-character hex UUID for Xcode."""
+    return os.urandom(12).hex().upper()
+
+
+def get_file_type(filename):
+    """Return Xcode file type for a given filename."""
+    ext = os.path.splitext(filename)[1].lower()
+    types = {
+        '.swift': 'sourcecode.swift',
+        '.m': 'sourcecode.c.objc',
+        '.h': 'sourcecode.c.h',
+        '.c': 'sourcecode.c.c',
+        '.xib': 'file.xib',
+        '.storyboard': 'file.storyboard',
+        '.png': 'image.png',
+        '.pdf': 'image.pdf',
+        '.icns': 'image.icns',
+        '.plist': 'text.plist.xml',
+        '.strings': 'text.plist.strings',
+        '.rtf': 'text.rtf',
+        '.json': 'text.json',
+        '.sdef': 'sourcecode.sdef',
+    }
+    return types.get(ext, 'file')
+
+
+def is_source_file(filename):
+    """Check if file should be added to Sources build phase."""
+    ext = os.path.splitext(filename)[1].lower()
+    return ext in ['.swift', '.m', '.c']
+
+
+def is_resource_file(filename):
+    """Check if file should be added to Resources build phase."""
+    ext = os.path.splitext(filename)[1].lower()
+    return ext in ['.xib', '.storyboard', '.png', '.pdf', '.icns', '.plist', 
+                   '.strings', '.rtf', '.json', '.sdef']
+
+
+def find_group_for_path(index, file_path):
+    """Find the group UUID and children insertion offset for a file path."""
+    # Extract directory from path
+    dir_name = os.path.basename(os.path.dirname(file_path))
+    group_name = GROUP_MAPPINGS.get(dir_name, dir_name)
+    
+    return index.groups.get(group_name, (None, None))
+
+
+def _plan_file_addition(index, file_path, insertions):
+    """Queue the project entries for a single file. Returns its UUIDs."""
+    filename = os.path.basename(file_path)
+    
+    # Check if file already exists in project
+    if filename in index.existing_names:
+        print(f"⚠️  Warning: {filename} may already be in the project")
+    index.existing_names.add(filename)
+    
+    # Generate UUIDs
+    file_ref_uuid = generate_uuid()
+    build_file_uuid = generate_uuid()
+    
+    file_type = get_file_type(filename)
+    
+    # 1. Add PBXBuildFile entry (if it's a source or resource file)
+    if is_source_file(filename) or is_resource_file(filename):
+        build_phase = "Sources" if is_source_file(filename) else "Resources"
+        build_file_entry = f"\t\t{build_file_uuid} /* {filename} in {build_phase} */ = {{isa = PBXBuildFile; fileRef = {file_ref_uuid} /* {filename} */; }};\n"
+        insertions.append((index.section_begins['PBXBuildFile'], build_file_entry.encode()))
+    
+    # 2. Add PBXFileReference entry
+    file_ref_entry = f"\t\t{file_ref_uuid} /* {filename} */ = {{isa = PBXFileReference; lastKnownFileType = {file_type}; name = {filename}; path = {file_path}; sourceTree = SOURCE_ROOT; }};\n"
+    insertions.append((index.section_begins['PBXFileReference'], file_ref_entry.encode()))
+    
+    # 3. Add to appropriate group
+    group_uuid, children_insert = find_group_for_path(index, file_path)
+    if group_uuid:
+        group_entry = f"\n\t\t\t\t{file_ref_uuid} /* {filename} */,"
+        insertions.append((children_insert, group_entry.encode()))
+    
+    # 4. Add to build phase (Sources or Resources)
+    if is_source_file(filename) and MAIN_TARGET_SOURCES_UUID in index.build_phases:
+        sources_entry = f"\n\t\t\t\t{build_file_uuid} /* {filename} in Sources */,"
+        insertions.append((index.build_phases[MAIN_TARGET_SOURCES_UUID], sources_entry.encode()))
+    elif is_resource_file(filename) and MAIN_TARGET_RESOURCES_UUID in index.build_phases:
+        resources_entry = f"\n\t\t\t\t{build_file_uuid} /* {filename} in Resources */,"
+        insertions.append((index.build_phases[MAIN_TARGET_RESOURCES_UUID], resources_entry.encode()))
+    
+    return file_ref_uuid, build_file_uuid
+
+
+def check_paths(file_paths):
+    """Exit if the project or any of the files to add is missing."""
+    for file_path in file_paths:
+        if not os.path.exists(file_path):
+            print(f"❌ Error: File does not exist: {file_path}")
+            sys.exit(1)
+    
+    if not os.path.exists(PROJECT_PATH):
+        print(f"❌ Error: Project file not found: {PROJECT_PATH}")
+        sys.exit(1)
+
+
+def plan_file_additions(index, file_paths):
+    """Plan the project entries for each file from the index.
+    
+    Returns a list of (offset, bytes) insertions for write_spliced() and a
+    list of (file_path, (file_ref_uuid, build_file_uuid)) pairs.
+    """
+    if 'PBXBuildFile' not in index.section_begins or 'PBXFileReference' not in index.section_begins:
+        print(f"❌ Error: Could not find PBXBuildFile/PBXFileReference sections in {PROJECT_PATH}")
+        sys.exit(1)
+    
+    insertions = []
+    added = []
+    for file_path in file_paths:
+        uuids = _plan_file_addition(index, file_path, insertions)
+        added.append((file_path, uuids))
+    
+    return insertions, added
+
+
+def report_added(added):
+    """Print the UUIDs planned for each added file."""
+    for file_path, (file_ref_uuid, build_file_uuid) in added:
+        filename = os.path.basename(file_path)
+        print(f"✅ Added {filename} to Xcode project")
+        print(f"   File ref UUID: {file_ref_uuid}")
+        if is_source_file(filename) or is_resource_file(filename):
+            print(f"   Build file UUID: {build_file_uuid}")
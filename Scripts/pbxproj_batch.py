@@ -0,0 +1,74 @@
+"""
+Batch add/remove operations on a Hermes project.pbxproj.
+
+Shared by the --batch option of xcode_add_file.py and xcode_remove_file.py,
+so a whole list of operations costs one read and one write of the project.
+"""
+
+import json
+import sys
+
+from pbxproj_additions import check_paths, plan_file_additions, report_added
+from pbxproj_index import PROJECT_PATH, build_index, read_project, write_spliced
+from pbxproj_removals import remove_files_from_content
+
+
+def _load_batch(batch_path):
+    """Read a batch file and split it into (removals, additions)."""
+    try:
+        with open(batch_path) as f:
+            ops = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: Could not read batch file {batch_path}: {e}")
+        sys.exit(1)
+    
+    if not isinstance(ops, list):
+        print(f"❌ Error: Batch file must contain a JSON list: {batch_path}")
+        sys.exit(1)
+    
+    removals = []
+    additions = []
+    for op in ops:
+        if isinstance(op, dict) and op.get('op') == 'remove' and isinstance(op.get('file'), str):
+            removals.append(op['file'])
+        elif isinstance(op, dict) and op.get('op') == 'add' and isinstance(op.get('path'), str):
+            additions.append(op['path'])
+        else:
+            print(f"❌ Error: Invalid batch operation: {op!r}")
+            sys.exit(1)
+    
+    return removals, additions
+
+
+def apply_batch(batch_path):
+    """Apply a JSON list of add/remove operations with one read and write.
+    
+    Each operation is {"op": "add", "path": ...} or {"op": "remove",
+    "file": ...}. Removals are applied before additions, so a file can be
+    removed and re-added in the same batch.
+    """
+    removals, additions = _load_batch(batch_path)
+    check_paths(additions)
+    
+    content = read_project(PROJECT_PATH)
+    
+    removed_uuids = set()
+    if removals:
+        content, removed_uuids = remove_files_from_content(content, removals)
+    
+    insertions = []
+    added = []
+    if additions:
+        # Index after removals, which shift every offset
+        index = build_index(content)
+        insertions, added = plan_file_additions(index, additions)
+    
+    if not removed_uuids and not added:
+        print("\n⚠️  No changes made to project file")
+        return
+    
+    write_spliced(PROJECT_PATH, content, insertions)
+    
+    if removed_uuids:
+        print(f"\n✅ Removed {len(removed_uuids)} reference(s) from Xcode project")
+    report_added(added)
@@ -0,0 +1,145 @@
+"""
+Single-pass index of a Hermes project.pbxproj.
+
+Shared by the xcode_add_file.py, xcode_remove_file.py and add_test_target.py
+scripts and the modules they use. One scan over the project records every
+anchor the scripts splice at, so none of them has to search the whole file
+more than once.
+"""
+
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+
+# The scripts' patterns use possessive quantifiers, new in Python 3.11
+if sys.version_info < (3, 11):
+    sys.exit("❌ Error: Python 3.11 or newer is required")
+
+# Relative to the repository root, where the scripts are run from
+PROJECT_PATH = 'Hermes.xcodeproj/project.pbxproj'
+
+# The project is read as bytes through a large buffer; this skips
+# decoding and re-encoding the whole file
+IO_BUFFER_SIZE = 64 * 1024
+
+# Largest slice handed to a single os.write() when saving the project
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+# One alternation matching, in a single linear pass:
+#   /* Begin PBXGroup section */ and /* End PBXGroup section */
+#   UUID /* Name */ = { isa = PBXGroup;
+#   children = (, files = ( and targets = (
+#   mainGroup = UUID and productRefGroup = UUID
+_SCANNER = re.compile(
+    rb'^/\* (?P<edge>Begin|End) (?P<section>\w+) section \*/\n?'
+    rb'|^[ \t]*+(?P<uuid>[A-F0-9]{24}) /\* (?P<name>[^*\n]*?) \*/ = \{\s*+isa = (?P<isa>\w+);'
+    rb'|^[ \t]*+(?P<list>children|files|targets) = \('
+    rb'|^[ \t]*+(?P<ref>mainGroup|productRefGroup) = (?P<ref_uuid>[A-F0-9]{24})',
+    re.MULTILINE,
+)
+
+
+@dataclass
+class ProjectIndex:
+    """Offsets into the project file, found in a single scan."""
+    section_begins: dict = field(default_factory=dict)  # section -> offset past its Begin marker
+    section_ends: dict = field(default_factory=dict)  # section -> offset of its End marker
+    groups: dict = field(default_factory=dict)  # name -> (uuid, children offset)
+    group_children: dict = field(default_factory=dict)  # uuid -> children offset
+    build_phases: dict = field(default_factory=dict)  # uuid -> files offset
+    native_targets: dict = field(default_factory=dict)  # name -> uuid
+    project_uuid: str = None
+    main_group: str = None
+    products_group: str = None
+    project_targets_insert: int = -1
+    existing_names: set = field(default_factory=set)
+
+
+def build_index(content):
+    """Scan project content (bytes) once and return its ProjectIndex."""
+    index = ProjectIndex()
+
+    # The object whose definition is being walked; lists belong to it
+    current_uuid = current_name = current_isa = None
+
+    for match in _SCANNER.finditer(content):
+        if match.group('section'):
+            section = match.group('section').decode()
+            if match.group('edge') == b'Begin':
+                index.section_begins.setdefault(section, match.end())
+            else:
+                index.section_ends.setdefault(section, match.start())
+        elif match.group('uuid'):
+            current_uuid = match.group('uuid').decode()
+            current_name = match.group('name').decode()
+            current_isa = match.group('isa').decode()
+            if current_isa == 'PBXFileReference':
+                index.existing_names.add(current_name)
+            elif current_isa == 'PBXNativeTarget':
+                index.native_targets.setdefault(current_name, current_uuid)
+            elif current_isa == 'PBXProject':
+                index.project_uuid = current_uuid
+        elif match.group('ref'):
+            if current_isa == 'PBXProject':
+                if match.group('ref') == b'mainGroup':
+                    index.main_group = match.group('ref_uuid').decode()
+                else:
+                    index.products_group = match.group('ref_uuid').decode()
+        else:
+            kind = match.group('list')
+            if kind == b'children' and current_isa == 'PBXGroup':
+                index.group_children[current_uuid] = match.end()
+                # First group with a given name wins
+                index.groups.setdefault(current_name, (current_uuid, match.end()))
+            elif kind == b'files' and current_isa and current_isa.endswith('BuildPhase'):
+                index.build_phases[current_uuid] = match.end()
+            elif kind == b'targets' and current_isa == 'PBXProject':
+                index.project_targets_insert = match.end()
+
+    # Older projects have no productRefGroup; Xcode names the group Products
+    if index.products_group is None and 'Products' in index.groups:
+        index.products_group = index.groups['Products'][0]
+
+    return index
+
+
+def read_project(project_path):
+    """Return the contents of project_path as bytes."""
+    with open(project_path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+        return f.read()
+
+
+def _spliced_chunks(content, insertions):
+    """Yield content with each (offset, bytes) insertion applied.
+
+    Slices of content are memoryviews of at most WRITE_CHUNK_SIZE bytes, so
+    the original is never copied. sorted() is stable, so insertions sharing
+    an offset keep their order.
+    """
+    view = memoryview(content)
+    last = 0
+    for offset, text in sorted(insertions, key=lambda insertion: insertion[0]):
+        for start in range(last, offset, WRITE_CHUNK_SIZE):
+            yield view[start:min(start + WRITE_CHUNK_SIZE, offset)]
+        yield text
+        last = offset
+    for start in range(last, len(content), WRITE_CHUNK_SIZE):
+        yield view[start:start + WRITE_CHUNK_SIZE]
+
+
+def write_spliced(project_path, content, insertions):
+    """Write content to project_path with the insertions spliced in.
+
+    The chunks go straight to a raw file descriptor, so the modified
+    project is never assembled in memory.
+    """
+    fd = os.open(project_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        for chunk in _spliced_chunks(content, insertions):
+            view = memoryview(chunk)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+    finally:
+        os.close(fd)
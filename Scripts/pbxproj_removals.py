@@ -0,0 +1,222 @@
+"""
+Removal of file references from a Hermes project.pbxproj.
+
+Used by xcode_remove_file.py and pbxproj_batch.py. Everything here works on
+project content in memory; callers do the reading and writing.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+# Formatting fixes applied after removals, fused into a single pass:
+# a leading comma after an opening parenthesis, a dangling separator
+# before a closing one on the same line, runs of blank lines and doubled
+# commas
+_CLEANUP = re.compile(rb'(?P<leading>\(\s*\n\s*,)|(?P<dangling>,[ \t]++\))|(?P<blank>\n{3,})|,\s*,')
+_CLEANUP_REPLACEMENTS = {'leading': b'(\n', 'dangling': b')', 'blank': b'\n\n', None: b','}
+
+# Any UUID, for checking what a removal left behind
+_UUID_TOKEN = re.compile(rb'\b[A-F0-9]{24}\b')
+
+# Tokens that matter when walking an object body to its closing brace
+_OBJECT_TOKEN = re.compile(rb'[{}"]')
+# Remainder of a quoted string after its opening quote
+_STRING_TAIL = re.compile(rb'[^"\\]*+(?:\\.[^"\\]*+)*+"', re.DOTALL)
+# What follows an object's closing brace on its line
+_DEFINITION_TAIL = re.compile(rb';?[ \t]*+\n?')
+
+
+@lru_cache(maxsize=512)
+def _patterns_for(basename):
+    """Compiled patterns matching UUIDs that reference basename."""
+    escaped = re.escape(basename.encode())
+    return (
+        # UUID /* filename */ or UUID /* filename in Sources */
+        re.compile(rb'([A-F0-9]{24})\s++/\*\s*+' + escaped + rb'(?:\s+in\s+\w++)?\s*+\*/'),
+        # path = filename or path = "filename"
+        re.compile(rb'([A-F0-9]{24})[^;]*path\s*=\s*"?[^"]*' + escaped + rb'"?\s*;'),
+        # name = filename
+        re.compile(rb'([A-F0-9]{24})[^;]*name\s*=\s*"?' + escaped + rb'"?\s*;'),
+    )
+
+
+# UUIDs per alternation, keeping each compiled pattern a manageable size
+_MAX_UUIDS_PER_PATTERN = 1000
+
+
+def _removal_patterns_for(uuids):
+    """Compiled patterns matching every reference to any of the UUIDs.
+    
+    None of the patterns scan past the line they start on and all use
+    possessive quantifiers, so matching stays linear in the size of the
+    project.
+    """
+    alt = b'(?:' + '|'.join(sorted(uuids)).encode() + b')'
+    return (
+        # Start of an object definition: UUID /* comment */ = {
+        re.compile(rb'^[ \t]*+' + alt + rb'[ \t]++/\*[^*\n]*+\*/[ \t]*+=[ \t]*+\{', re.MULTILINE),
+        # Array entries alone on their line: UUID /* comment */,
+        re.compile(rb'^[ \t]*+' + alt + rb'(?:[ \t]++/\*[^*\n]*+\*/)?[ \t]*+,?[ \t]*+\n', re.MULTILINE),
+        # Array entries sharing a line, such as UUID /* comment */,); or
+        # (A, UUID); never a value such as fileRef = UUID /* comment */;
+        re.compile(rb'(?<=[(,\s])' + alt + rb'(?:[ \t]++/\*[^*\n]*+\*/)?[ \t]*+(?:,[ \t]*+|(?=\s*+\)))'),
+    )
+
+
+def _object_end(content, open_brace):
+    """Return the offset just past the brace closing the one at open_brace.
+    
+    Walks the body counting braces and skipping quoted strings, so nested
+    dictionaries such as build settings are removed in full.
+    """
+    depth = 0
+    pos = open_brace
+    while True:
+        match = _OBJECT_TOKEN.search(content, pos)
+        if not match:
+            return len(content)
+        pos = match.end()
+        token = match.group()
+        if token == b'"':
+            string_end = _STRING_TAIL.match(content, pos)
+            pos = string_end.end() if string_end else len(content)
+        elif token == b'{':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def _remove_definitions(content, header_pattern):
+    """Remove every object whose definition starts with header_pattern.
+    
+    Returns the new content and the number of objects removed.
+    """
+    pieces = []
+    last = 0
+    for match in header_pattern.finditer(content):
+        if match.start() < last:
+            continue
+        end = _object_end(content, match.end() - 1)
+        pieces.append(content[last:match.start()])
+        last = _DEFINITION_TAIL.match(content, end).end()
+    pieces.append(content[last:])
+    return b''.join(pieces), len(pieces) - 1
+
+
+def find_uuids_for_file(content, filename):
+    """Find all UUIDs that reference a file.
+    
+    content may be bytes or a read-only mmap of the project.
+    """
+    uuids = set()
+    
+    # Extract just the filename if a path was provided
+    basename = os.path.basename(filename)
+    needle = basename.encode()
+    
+    # Bail out before any regex work when the name never appears
+    first = content.find(needle)
+    if first == -1:
+        return uuids
+    last = content.rfind(needle) + len(needle)
+    
+    # Every match lies within the statements holding the first and last
+    # occurrence, so widen to the enclosing ';' on each side and scan only that
+    start = content.rfind(b';', 0, first) + 1
+    end = content.find(b';', last)
+    region = content[start:end + 1 if end != -1 else len(content)]
+    
+    for pattern in _patterns_for(basename):
+        uuids.update(uuid.decode() for uuid in pattern.findall(region))
+    
+    return uuids
+
+
+def remove_uuid_references(content, uuids):
+    """Remove all references to the given UUIDs from the project file.
+    
+    Returns the new content and the number of matches removed.
+    """
+    
+    removed = 0
+    uuids = sorted(uuids)
+    for start in range(0, len(uuids), _MAX_UUIDS_PER_PATTERN):
+        chunk = uuids[start:start + _MAX_UUIDS_PER_PATTERN]
+        header_pattern, line_pattern, inline_pattern = _removal_patterns_for(chunk)
+        
+        # Object definitions first, then whole-line array entries, then
+        # any entries left sharing a line with other tokens
+        content, count = _remove_definitions(content, header_pattern)
+        removed += count
+        for pattern in (line_pattern, inline_pattern):
+            content, count = pattern.subn(b'', content)
+            removed += count
+    
+    return content, removed
+
+
+def cleanup_project_file(content):
+    """Clean up formatting issues after removals."""
+    return _CLEANUP.sub(lambda match: _CLEANUP_REPLACEMENTS[match.lastgroup], content)
+
+
+def find_uuids_for_files(content, filenames):
+    """Find the UUIDs referencing any of the files, reporting each file."""
+    all_uuids = set()
+    
+    for filename in filenames:
+        basename = os.path.basename(filename)
+        
+        # Find all UUIDs for this file
+        uuids = find_uuids_for_file(content, filename)
+        
+        if not uuids:
+            print(f"⚠️  Warning: No references found for {basename}")
+            continue
+        
+        print(f"Found {len(uuids)} UUID(s) for {basename}")
+        all_uuids.update(uuids)
+    
+    return all_uuids
+
+
+def remove_uuids(content, all_uuids):
+    """Strip the UUIDs and tidy up. Returns content and the UUIDs removed.
+    
+    A UUID only counts as removed once no reference to it is left; any
+    that are still referenced are reported. If none could be removed the
+    original content is returned untouched.
+    """
+    if not all_uuids:
+        return content, set()
+    
+    # Remove all references in one sweep, tracking whether anything changed
+    # instead of comparing against the original project
+    original = content
+    content, removed = remove_uuid_references(content, all_uuids)
+    if removed:
+        content = cleanup_project_file(content)
+    
+    # One scan over the result for references the patterns did not reach
+    remaining = all_uuids.intersection(uuid.decode() for uuid in _UUID_TOKEN.findall(content))
+    if remaining:
+        print(f"⚠️  Warning: {len(remaining)} UUID(s) are still referenced and were not removed: "
+              f"{', '.join(sorted(remaining))}")
+    
+    removed_uuids = all_uuids - remaining
+    if not removed_uuids:
+        return original, set()
+    
+    return content, removed_uuids
+
+
+def remove_files_from_content(content, filenames):
+    """Remove one or more files from in-memory project content.
+    
+    Returns the new content and the set of UUIDs removed, which is empty
+    when nothing changed.
+    """
+    return remove_uuids(content, find_uuids_for_files(content, filenames))
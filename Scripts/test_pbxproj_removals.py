@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Regression tests for pbxproj_removals.py.
+
+Usage:
+    python3 -m unittest discover Scripts
+"""
+
+import contextlib
+import io
+import unittest
+
+from pbxproj_removals import remove_files_from_content
+
+KEEP_REF = 'AAAAAAAAAAAAAAAAAAAAAAAA'
+KEEP_BUILD = 'BBBBBBBBBBBBBBBBBBBBBBBB'
+GONE_REF = 'CCCCCCCCCCCCCCCCCCCCCCCC'
+GONE_BUILD = 'DDDDDDDDDDDDDDDDDDDDDDDD'
+
+# Entries written by older versions of xcode_add_file.py close their list
+# on the same line: UUID /* name */,);
+PROJECT = f"""\
+/* Begin PBXBuildFile section */
+		{KEEP_BUILD} /* Keep.swift in Sources */ = {{isa = PBXBuildFile; fileRef = {KEEP_REF} /* Keep.swift */; }};
+		{GONE_BUILD} /* Gone.swift in Sources */ = {{isa = PBXBuildFile; fileRef = {GONE_REF} /* Gone.swift */; }};
+/* End PBXBuildFile section */
+
+/* Begin PBXFileReference section */
+		{KEEP_REF} /* Keep.swift */ = {{isa = PBXFileReference; lastKnownFileType = sourcecode.swift; path = Keep.swift; sourceTree = "<group>"; }};
+		{GONE_REF} /* Gone.swift */ = {{isa = PBXFileReference; lastKnownFileType = sourcecode.swift; path = Gone.swift; sourceTree = "<group>"; }};
+/* End PBXFileReference section */
+
+/* Begin PBXGroup section */
+		EEEEEEEEEEEEEEEEEEEEEEEE /* Swift */ = {{
+			isa = PBXGroup;
+			children = (
+				{KEEP_REF} /* Keep.swift */,
+				{GONE_REF} /* Gone.swift */,);
+			path = Swift;
+			sourceTree = "<group>";
+		}};
+/* End PBXGroup section */
+
+/* Begin PBXSourcesBuildPhase section */
+		FFFFFFFFFFFFFFFFFFFFFFFF /* Sources */ = {{
+			isa = PBXSourcesBuildPhase;
+			files = ({KEEP_BUILD} /* Keep.swift in Sources */, {GONE_BUILD} /* Gone.swift in Sources */);
+		}};
+/* End PBXSourcesBuildPhase section */
+""".encode()
+
+
+def _remove(content, filenames):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return remove_files_from_content(content, filenames)
+
+
+class RemoveFilesFromContentTests(unittest.TestCase):
+
+    def test_removes_entries_sharing_a_line(self):
+        content, removed = _remove(PROJECT, ['Gone.swift'])
+
+        self.assertEqual(removed, {GONE_REF, GONE_BUILD})
+        self.assertNotIn(GONE_REF.encode(), content)
+        self.assertNotIn(GONE_BUILD.encode(), content)
+        self.assertIn(f'{KEEP_REF} /* Keep.swift */,\n'.encode(), content)
+        self.assertIn(f'files = ({KEEP_BUILD} /* Keep.swift in Sources */);'.encode(), content)
+
+    def test_reports_only_uuids_that_are_gone(self):
+        # A scalar value is not a list entry, so the reference survives
+        project = PROJECT + f"\t\tproductReference = {GONE_REF} /* Gone.swift */;\n".encode()
+        content, removed = _remove(project, ['Gone.swift'])
+
+        self.assertEqual(removed, {GONE_BUILD})
+        self.assertIn(GONE_REF.encode(), content)
+        self.assertNotIn(GONE_BUILD.encode(), content)
+
+    def test_leaves_project_alone_when_file_is_absent(self):
+        content, removed = _remove(PROJECT, ['Missing.swift'])
+
+        self.assertEqual(removed, set())
+        self.assertEqual(content, PROJECT)
+
+
+if __name__ == '__main__':
+    unittest.main()
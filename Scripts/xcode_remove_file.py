@@ -11,6 +11,7 @@ Removes all references to a file including:
 Usage:
     python3 Scripts/xcode_remove_file.py <filename_or_path>
     python3 Scripts/xcode_remove_file.py <file1> <file2> ...
+    python3 Scripts/xcode_remove_file.py --batch <ops.json>
     
 Examples:
     python3 Scripts/xcode_remove_file.py OldFile.swift
@@ -19,73 +20,13 @@ Examples:
 """
 
 import argparse
+import mmap
 import os
-import re
 import sys
 
-PROJECT_PATH = 'Hermes.xcodeproj/project.pbxproj'
-
-
-def find_uuids_for_file(content, filename):
-    """Find all UUIDs that reference a file."""
-    uuids = set()
-    
-    # Extract just the filename if a path was provided
-    basename = os.path.basename(filename)
-    
-    # Pattern 1: UUID /* filename */ or UUID /* filename in Sources */
-    pattern1 = rf'([A-F0-9]{{24}})\s+/\*\s*{re.escape(basename)}(?:\s+in\s+\w+)?\s*\*/'
-    matches = re.findall(pattern1, content)
-    uuids.update(matches)
-    
-    # Pattern 2: path = filename or path = "filename"
-    pattern2 = rf'([A-F0-9]{{24}})[^;]*path\s*=\s*"?[^"]*{re.escape(basename)}"?\s*;'
-    matches = re.findall(pattern2, content)
-    uuids.update(matches)
-    
-    # Pattern 3: name = filename
-    pattern3 = rf'([A-F0-9]{{24}})[^;]*name\s*=\s*"?{re.escape(basename)}"?\s*;'
-    matches = re.findall(pattern3, content)
-    uuids.update(matches)
-    
-    return uuids
-
-
-def remove_uuid_references(content, uuid):
-    """Remove all references to a UUID from the project file."""
-    
-    # Remove complete object definitions (PBXBuildFile, PBXFileReference entries)
-    # Pattern: UUID /* comment */ = { ... };
-    pattern = rf'\s*{uuid}\s+/\*[^*]*\*/\s*=\s*\{{[^}}]*\}};?\n?'
-    content = re.sub(pattern, '', content)
-    
-    # Remove from arrays with comments: UUID /* comment */,
-    pattern = rf',?\s*{uuid}\s+/\*[^*]*\*/,?\n?'
-    content = re.sub(pattern, '', content)
-    
-    # Remove standalone UUID references in arrays
-    pattern = rf',?\s*{uuid},?\n?'
-    content = re.sub(pattern, '', content)
-    
-    return content
-
-
-def cleanup_project_file(content):
-    """Clean up formatting issues after removals."""
-    
-    # Fix trailing commas before closing parenthesis
-    content = re.sub(r',(\s*\n\s*\))', r'\1', content)
-    
-    # Fix leading commas after opening parenthesis
-    content = re.sub(r'\(\s*\n\s*,', '(\n', content)
-    
-    # Remove excessive blank lines
-    content = re.sub(r'\n{3,}', '\n\n', content)
-    
-    # Fix double commas
-    content = re.sub(r',\s*,', ',', content)
-    
-    return content
+from pbxproj_batch import apply_batch
+from pbxproj_index import IO_BUFFER_SIZE, PROJECT_PATH, read_project
+from pbxproj_removals import find_uuids_for_files, remove_uuids
 
 
 def remove_files_from_project(filenames):
@@ -95,39 +36,26 @@ def remove_files_from_project(filenames):
         print(f"❌ Error: Project file not found: {PROJECT_PATH}")
         sys.exit(1)
     
-    with open(PROJECT_PATH, 'r') as f:
-        content = f.read()
-    
-    original_content = content
-    total_uuids_removed = 0
-    
-    for filename in filenames:
-        basename = os.path.basename(filename)
-        
-        # Find all UUIDs for this file
-        uuids = find_uuids_for_file(content, filename)
-        
-        if not uuids:
-            print(f"⚠️  Warning: No references found for {basename}")
-            continue
-        
-        print(f"Found {len(uuids)} UUID(s) for {basename}")
-        
-        # Remove all references
-        for uuid in uuids:
-            content = remove_uuid_references(content, uuid)
-        
-        total_uuids_removed += len(uuids)
+    # The lookup only reads, so scan a memory map of the project rather
+    # than loading it; the file is read in full only if there is work to do.
+    # An empty file cannot be mapped and has nothing to find anyway.
+    if os.path.getsize(PROJECT_PATH) == 0:
+        all_uuids = find_uuids_for_files(b'', filenames)
+    else:
+        with open(PROJECT_PATH, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            all_uuids = find_uuids_for_files(mapped, filenames)
     
-    # Clean up the file
-    content = cleanup_project_file(content)
+    removed_uuids = set()
+    if all_uuids:
+        content = read_project(PROJECT_PATH)
+        content, removed_uuids = remove_uuids(content, all_uuids)
     
     # Only write if changes were made
-    if content != original_content:
-        with open(PROJECT_PATH, 'w') as f:
+    if removed_uuids:
+        with open(PROJECT_PATH, 'wb', buffering=IO_BUFFER_SIZE) as f:
             f.write(content)
         
-        print(f"\n✅ Removed {total_uuids_removed} reference(s) from Xcode project")
+        print(f"\n✅ Removed {len(removed_uuids)} reference(s) from Xcode project")
         print(f"   Files processed: {len(filenames)}")
     else:
         print("\n⚠️  No changes made to project file")
@@ -139,13 +67,24 @@ def main():
         epilog='Examples:\n'
                '  %(prog)s OldFile.swift\n'
                '  %(prog)s Keychain.m Keychain.h\n'
-               '  %(prog)s Sources/Legacy/OldClass.m',
+               '  %(prog)s Sources/Legacy/OldClass.m\n'
+               '  %(prog)s --batch ops.json',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
-    parser.add_argument('files', nargs='+', help='File(s) to remove (filename or path)')
+    parser.add_argument('files', nargs='*', help='File(s) to remove (filename or path)')
+    parser.add_argument('--batch', metavar='OPS_JSON',
+                        help='Apply a JSON list of add/remove operations in one pass '
+                             '(see pbxproj_batch.py)')
     
     args = parser.parse_args()
-    remove_files_from_project(args.files)
+    if args.batch:
+        if args.files:
+            parser.error('--batch cannot be combined with file arguments')
+        apply_batch(args.batch)
+    elif args.files:
+        remove_files_from_project(args.files)
+    else:
+        parser.error('at least one file or --batch is required')
 
 
 if __name__ == '__main__':